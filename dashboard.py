@@ -4,10 +4,11 @@ Interface visual para análise dos dados coletados
 """
 
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, dash_table, Input, Output, State
+import re
 import plotly.graph_objs as go
 import plotly.express as px
-from database import Database
+from database import get_database
 import pandas as pd
 
 # Cores baseadas na imagem (tons vibrantes e modernos)
@@ -22,6 +23,36 @@ COLORS = {
     'border': '#e1e8ed'
 }
 
+# Linhas por página da tabela e máximo de opções carregadas no seletor
+TABLE_PAGE_SIZE = 25
+SELECTOR_LIMIT = 50
+
+# Colunas exibidas na tabela de moedas
+COIN_TABLE_COLUMNS = [
+    {'name': '#', 'id': 'rank', 'type': 'numeric'},
+    {'name': 'Name', 'id': 'name', 'type': 'text'},
+    {'name': 'Symbol', 'id': 'symbol', 'type': 'text'},
+    {'name': 'Price (USD)', 'id': 'price', 'type': 'numeric'},
+    {'name': 'Market Cap (USD)', 'id': 'market_cap', 'type': 'numeric'},
+    {'name': 'Volume 24h (USD)', 'id': 'volume_24h', 'type': 'numeric'},
+    {'name': 'Change 24h (%)', 'id': 'change_24h', 'type': 'numeric'}
+]
+
+# Operadores do filter_query do DataTable e seus equivalentes no banco
+COIN_TABLE_OPERATORS = {
+    'eq': '=', '=': '=',
+    'ne': '!=', '!=': '!=',
+    'lt': '<', '<': '<',
+    'le': '<=', '<=': '<=',
+    'gt': '>', '>': '>',
+    'ge': '>=', '>=': '>=',
+    'contains': 'contains'
+}
+
+COIN_TABLE_FILTER_PATTERN = re.compile(
+    r'^\{(\w+)\}\s*([is]?)(contains|eq|ne|lt|le|gt|ge|'
+    r'!=|<=|>=|=|<|>)\s*(.+)$')
+
 
 def create_dashboard():
     """Cria e configura o dashboard Dash"""
@@ -92,10 +123,52 @@ def create_dashboard():
                 }),
                 dcc.Dropdown(
                     id='crypto-selector',
+                    placeholder='Type to search by name or symbol...',
                     style={'width': '100%'}
                 )
             ]),
 
+            # Tabela de moedas (paginação, ordenação e filtro no servidor)
+            html.Div(style={
+                'backgroundColor': COLORS['card'],
+                'padding': '1.5rem',
+                'borderRadius': '12px',
+                'marginBottom': '2rem',
+                'boxShadow': '0 2px 4px rgba(0,0,0,0.05)',
+                'border': f'1px solid {COLORS["border"]}'
+            }, children=[
+                html.H3('All Cryptocurrencies', style={
+                    'marginTop': '0',
+                    'color': COLORS['text'],
+                    'fontSize': '1.3rem',
+                    'fontWeight': '600'
+                }),
+                dash_table.DataTable(
+                    id='coin-table',
+                    columns=COIN_TABLE_COLUMNS,
+                    page_current=0,
+                    page_size=TABLE_PAGE_SIZE,
+                    page_action='custom',
+                    sort_action='custom',
+                    sort_mode='multi',
+                    sort_by=[],
+                    filter_action='custom',
+                    filter_query='',
+                    filter_options={'case': 'insensitive'},
+                    style_table={'overflowX': 'auto'},
+                    style_header={
+                        'backgroundColor': COLORS['background'],
+                        'fontWeight': '600',
+                        'color': COLORS['text']
+                    },
+                    style_cell={
+                        'padding': '0.5rem',
+                        'color': COLORS['text'],
+                        'border': f'1px solid {COLORS["border"]}'
+                    }
+                )
+            ]),
+
             # Gráficos
             html.Div(style={
                 'display': 'grid',
@@ -160,21 +233,22 @@ def create_dashboard():
 
     @app.callback(
         [Output('stats-cards', 'children'),
-         Output('crypto-selector', 'options'),
          Output('crypto-selector', 'value')],
-        [Input('interval-component', 'n_intervals')]
+        [Input('interval-component', 'n_intervals')],
+        [State('crypto-selector', 'value')]
     )
-    def update_stats_and_selector(n):
-        db = Database()
+    def update_stats_and_selector(n, selected_crypto):
+        db = get_database()
         stats = db.get_statistics()
-        latest_data = db.get_latest_data()
+        top_coin = db.get_latest_data(limit=1)
 
-        if latest_data.empty:
-            return [html.Div("Loading data...")], [], None
+        if top_coin.empty:
+            return [html.Div("Loading data...")], None
 
-        # Cards de estatísticas
-        total_market_cap = latest_data['market_cap'].sum()
-        avg_change = latest_data['change_24h'].mean()
+        # Cards de estatísticas (agregados calculados no SQL)
+        market = db.get_market_summary()
+        total_market_cap = market['total_market_cap']
+        avg_change = market['avg_change']
 
         cards = html.Div(style={
             'display': 'grid',
@@ -194,15 +268,81 @@ def create_dashboard():
                                  'primary'] if avg_change >= 0 else '#e74c3c')
         ])
 
-        # Opções do dropdown
-        options = [{'label': f"{row['name']} ({row['symbol']})",
-                    'value': row['symbol']}
-                   for _, row in latest_data.iterrows()]
+        # Mantém a seleção atual; usa a primeira do ranking como padrão
+        if selected_crypto:
+            return cards, dash.no_update
+
+        return cards, top_coin.iloc[0]['symbol']
 
-        default_value = latest_data.iloc[0][
-            'symbol'] if not latest_data.empty else None
+    @app.callback(
+        Output('crypto-selector', 'options'),
+        [Input('crypto-selector', 'search_value'),
+         Input('crypto-selector', 'value')],
+        [State('crypto-selector', 'options')]
+    )
+    def update_selector_options(search_value, selected_crypto,
+                                current_options):
+        db = get_database()
+        coins = db.search_coins(search_value, limit=SELECTOR_LIMIT)
 
-        return cards, options, default_value
+        options = [create_coin_option(row['name'], row['symbol'])
+                   for _, row in coins.iterrows()]
+
+        # A opção selecionada precisa continuar na lista para não ser limpa
+        if selected_crypto and selected_crypto not in coins['symbol'].values:
+            selected_option = next(
+                (option for option in current_options or []
+                 if option['value'] == selected_crypto), None)
+
+            if selected_option is None:
+                matches = db.search_coins(selected_crypto,
+                                          limit=SELECTOR_LIMIT)
+                matches = matches[matches['symbol'] == selected_crypto]
+                name = (matches.iloc[0]['name'] if not matches.empty
+                        else selected_crypto)
+                selected_option = create_coin_option(name, selected_crypto)
+
+            options.insert(0, selected_option)
+
+        return options
+
+    @app.callback(
+        [Output('coin-table', 'data'),
+         Output('coin-table', 'page_count'),
+         Output('coin-table', 'page_current')],
+        [Input('coin-table', 'page_current'),
+         Input('coin-table', 'page_size'),
+         Input('coin-table', 'sort_by'),
+         Input('coin-table', 'filter_query'),
+         Input('interval-component', 'n_intervals')]
+    )
+    def update_coin_table(page_current, page_size, sort_by, filter_query, n):
+        db = get_database()
+
+        # Novo filtro ou ordenação volta para a primeira página
+        if any(trigger['prop_id'] in ('coin-table.sort_by',
+                                      'coin-table.filter_query')
+               for trigger in dash.callback_context.triggered):
+            page_current = 0
+
+        query = {
+            'page_size': page_size,
+            'sort_by': [(col['column_id'], col['direction'])
+                        for col in sort_by or []],
+            'filters': parse_filter_query(filter_query)
+        }
+
+        page_current = page_current or 0
+        page, total_rows = db.get_latest_page(page=page_current, **query)
+        page_count = max(1, -(-total_rows // page_size))
+
+        # Se o filtro ou uma nova coleta reduziu o total, vai para a última página
+        if page_current >= page_count:
+            page_current = page_count - 1
+            page, total_rows = db.get_latest_page(page=page_current, **query)
+            page_count = max(1, -(-total_rows // page_size))
+
+        return page.to_dict('records'), page_count, page_current
 
     @app.callback(
         [Output('price-chart', 'figure'),
@@ -212,7 +352,7 @@ def create_dashboard():
          Input('interval-component', 'n_intervals')]
     )
     def update_charts(selected_crypto, n):
-        db = Database()
+        db = get_database()
 
         if not selected_crypto:
             empty_fig = go.Figure()
@@ -266,7 +406,7 @@ def create_dashboard():
         )
 
         # Gráfico de ranking
-        latest = db.get_latest_data().head(10)
+        latest = db.get_latest_data(limit=10)
 
         ranking_fig = go.Figure()
         if not latest.empty:
@@ -299,6 +439,11 @@ def create_dashboard():
     return app
 
 
+def create_coin_option(name, symbol):
+    """Cria uma opção do seletor de criptomoedas"""
+    return {'label': f"{name} ({symbol})", 'value': symbol}
+
+
 def create_stat_card(title, value, color):
     """Cria um card de estatística"""
     return html.Div(style={
@@ -320,4 +465,31 @@ def create_stat_card(title, value, color):
             'fontSize': '2rem',
             'fontWeight': '700'
         })
-    ])
\ No newline at end of file
+    ])
+
+
+def parse_filter_query(filter_query):
+    """
+    Converte o filter_query do DataTable em filtros para o banco
+    Args:
+        filter_query: Texto no formato '{coluna} operador valor && ...'
+    Returns: Lista de tuplas (coluna, operador, valor, caso)
+    """
+    filters = []
+
+    for part in (filter_query or '').split(' && '):
+        match = COIN_TABLE_FILTER_PATTERN.match(part.strip())
+        if not match:
+            continue
+
+        column, case, operator, value = match.groups()
+
+        value = value.strip()
+        if value[:1] == value[-1:] and value[:1] in ('"', "'", '`'):
+            value = value[1:-1]
+
+        # Sem prefixo vale o filter_options da tabela, que ignora maiúsculas
+        filters.append((column, COIN_TABLE_OPERATORS[operator], value,
+                        case or 'i'))
+
+    return filters
@@ -1,14 +1,139 @@
 """
 Módulo de Gerenciamento de Banco de Dados
-Gerencia armazenamento e recuperação de dados no SQLite
+Define a interface de armazenamento e o backend padrão em SQLite
 """
 
+import os
 import sqlite3
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 import pandas as pd
 
 
-class Database:
+# Colunas que a tabela paginada pode ordenar e filtrar, com seus tipos
+TABLE_COLUMNS = {
+    'rank': 'numeric',
+    'name': 'text',
+    'symbol': 'text',
+    'price': 'numeric',
+    'market_cap': 'numeric',
+    'volume_24h': 'numeric',
+    'change_24h': 'numeric'
+}
+
+# Operadores de comparação aceitos nos filtros, além de 'contains'
+COMPARISON_OPERATORS = ('=', '!=', '<', '<=', '>', '>=')
+
+
+def escape_like(value):
+    """Escapa os curingas do LIKE para que o texto seja buscado literalmente"""
+    return (str(value).replace('\\', '\\\\')
+            .replace('%', '\\%').replace('_', '\\_'))
+
+
+class StorageBackend(ABC):
+    """Interface comum aos backends de armazenamento"""
+
+    # Marcador de parâmetro, LIKE sem distinção de maiúsculas e busca de
+    # substring com distinção de maiúsculas usados pelo driver
+    placeholder = '?'
+    like_operator = 'LIKE'
+    position_function = 'instr'
+
+    @abstractmethod
+    def save_data(self, data_list):
+        """Salva uma lista de dados no banco"""
+
+    @abstractmethod
+    def get_latest_data(self, limit=None):
+        """Recupera os dados mais recentes"""
+
+    @abstractmethod
+    def get_latest_page(self, page=0, page_size=25, sort_by=None,
+                        filters=None):
+        """Recupera uma página dos dados mais recentes"""
+
+    @abstractmethod
+    def search_coins(self, search=None, limit=50):
+        """Busca moedas do snapshot mais recente pelo nome ou símbolo"""
+
+    @abstractmethod
+    def get_market_summary(self):
+        """Calcula os totais de mercado do snapshot mais recente"""
+
+    @abstractmethod
+    def get_historical_data(self, symbol=None, hours=24):
+        """Recupera dados históricos"""
+
+    @abstractmethod
+    def get_statistics(self):
+        """Calcula estatísticas gerais dos dados"""
+
+    @abstractmethod
+    def delete_old_data(self, days=7):
+        """Remove dados mais antigos que X dias"""
+
+    @abstractmethod
+    def get_coin_summary(self, symbol):
+        """Retorna um resumo estatístico de uma criptomoeda específica"""
+
+    def build_page_clauses(self, sort_by=None, filters=None):
+        """
+        Monta as cláusulas WHERE e ORDER BY da tabela paginada
+        Args:
+            sort_by: Lista de tuplas (coluna, 'asc' ou 'desc')
+            filters: Lista de tuplas (coluna, operador, valor, caso), onde
+                caso 'i' ignora maiúsculas e 's' as diferencia
+        Returns: Tupla (cláusula WHERE, parâmetros, cláusula ORDER BY)
+        """
+        where = ['timestamp = (SELECT MAX(timestamp) FROM crypto_prices)']
+        params = []
+
+        for column, operator, value, case in filters or []:
+            if column not in TABLE_COLUMNS:
+                continue
+
+            if operator == 'contains':
+                # Busca de texto, também em colunas numéricas
+                value = str(value)
+                text_column = f'CAST({column} AS TEXT)'
+                if case == 'i':
+                    where.append(f'{text_column} {self.like_operator} '
+                                 f"{self.placeholder} ESCAPE '\\'")
+                    value = f'%{escape_like(value)}%'
+                else:
+                    where.append(f'{self.position_function}'
+                                 f'({text_column}, {self.placeholder}) > 0')
+            elif operator not in COMPARISON_OPERATORS:
+                continue
+            elif TABLE_COLUMNS[column] == 'numeric':
+                # Colunas numéricas só comparam com números
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+                where.append(f'{column} {operator} {self.placeholder}')
+            elif case == 'i':
+                value = str(value)
+                where.append(f'LOWER({column}) {operator} '
+                             f'LOWER({self.placeholder})')
+            else:
+                value = str(value)
+                where.append(f'{column} {operator} {self.placeholder}')
+
+            params.append(value)
+
+        order = [f'{column} {"DESC" if direction == "desc" else "ASC"}'
+                 for column, direction in sort_by or []
+                 if column in TABLE_COLUMNS]
+        # Desempate estável para que LIMIT/OFFSET não repita linhas
+        order.append('rank ASC')
+        order.append('id ASC')
+
+        return ' AND '.join(where), params, ', '.join(order)
+
+
+class Database(StorageBackend):
     """Classe para gerenciar operações no banco de dados SQLite"""
 
     def __init__(self, db_name='crypto_data.db'):
@@ -48,6 +173,11 @@ class Database:
             ON crypto_prices(symbol)
         ''')
 
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_timestamp_rank 
+            ON crypto_prices(timestamp, rank)
+        ''')
+
         conn.commit()
         conn.close()
 
@@ -79,9 +209,11 @@ class Database:
         conn.commit()
         conn.close()
 
-    def get_latest_data(self):
+    def get_latest_data(self, limit=None):
         """
         Recupera os dados mais recentes
+        Args:
+            limit: Número máximo de linhas (opcional)
         Returns: DataFrame com os dados mais recentes
         """
         conn = self.get_connection()
@@ -92,10 +224,106 @@ class Database:
             ORDER BY rank
         '''
 
-        df = pd.read_sql_query(query, conn)
+        if limit is not None:
+            df = pd.read_sql_query(query + ' LIMIT ?', conn,
+                                   params=(int(limit),))
+        else:
+            df = pd.read_sql_query(query, conn)
+
+        conn.close()
+        return df
+
+    def get_latest_page(self, page=0, page_size=25, sort_by=None,
+                        filters=None):
+        """
+        Recupera uma página dos dados mais recentes, ordenando e filtrando no SQL
+        Args:
+            page: Índice da página (começa em 0)
+            page_size: Número de linhas por página
+            sort_by: Lista de tuplas (coluna, 'asc' ou 'desc')
+            filters: Lista de tuplas (coluna, operador, valor, caso)
+        Returns: Tupla (DataFrame da página, total de linhas filtradas)
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        where_clause, params, order_clause = self.build_page_clauses(
+            sort_by, filters)
+
+        # Mesma transação de leitura para o total e a página
+        cursor.execute('BEGIN')
+        cursor.execute(
+            f'SELECT COUNT(*) FROM crypto_prices WHERE {where_clause}', params)
+        total_rows = cursor.fetchone()[0]
+
+        query = f'''
+            SELECT * FROM crypto_prices 
+            WHERE {where_clause}
+            ORDER BY {order_clause}
+            LIMIT ? OFFSET ?
+        '''
+
+        df = pd.read_sql_query(
+            query, conn,
+            params=(*params, int(page_size), int(page) * int(page_size)))
+        conn.close()
+        return df, total_rows
+
+    def search_coins(self, search=None, limit=50):
+        """
+        Busca moedas do snapshot mais recente pelo nome ou símbolo
+        Args:
+            search: Texto a ser buscado (opcional)
+            limit: Número máximo de resultados
+        Returns: DataFrame com nome e símbolo das moedas encontradas
+        """
+        conn = self.get_connection()
+
+        if search:
+            query = '''
+                SELECT name, symbol FROM crypto_prices 
+                WHERE timestamp = (SELECT MAX(timestamp) FROM crypto_prices)
+                AND (name LIKE ? ESCAPE '\\' OR symbol LIKE ? ESCAPE '\\')
+                ORDER BY rank
+                LIMIT ?
+            '''
+            pattern = f'%{escape_like(search)}%'
+            df = pd.read_sql_query(query, conn,
+                                   params=(pattern, pattern, int(limit)))
+        else:
+            query = '''
+                SELECT name, symbol FROM crypto_prices 
+                WHERE timestamp = (SELECT MAX(timestamp) FROM crypto_prices)
+                ORDER BY rank
+                LIMIT ?
+            '''
+            df = pd.read_sql_query(query, conn, params=(int(limit),))
+
         conn.close()
         return df
 
+    def get_market_summary(self):
+        """
+        Calcula os totais de mercado do snapshot mais recente
+        Returns: Dicionário com market cap total e variação média
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT SUM(market_cap), AVG(change_24h) 
+            FROM crypto_prices 
+            WHERE timestamp = (SELECT MAX(timestamp) FROM crypto_prices)
+        ''')
+
+        result = cursor.fetchone()
+        conn.close()
+
+        return {
+            'total_market_cap': result[0] or 0,
+            'avg_change': result[1] or 0
+        }
+
     def get_historical_data(self, symbol=None, hours=24):
         """
         Recupera dados históricos
@@ -207,4 +435,20 @@ class Database:
                 'max_price': result[3],
                 'avg_volume': result[4]
             }
-        return None
\ No newline at end of file
+        return None
+
+
+def get_database():
+    """
+    Retorna o backend de armazenamento configurado
+    Usa PostgreSQL quando DATABASE_URL aponta para um servidor Postgres,
+    caso contrário usa o SQLite local
+    Returns: Instância de StorageBackend
+    """
+    database_url = os.environ.get('DATABASE_URL', '')
+
+    if database_url.startswith(('postgres://', 'postgresql://')):
+        from postgres_database import PostgresDatabase
+        return PostgresDatabase(database_url)
+
+    return Database()
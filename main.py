@@ -7,7 +7,7 @@ import schedule
 import time
 import threading
 from scraper import CryptoScraper
-from database import Database
+from database import get_database
 from dashboard import create_dashboard
 
 
@@ -18,7 +18,7 @@ def run_scraping():
     data = scraper.fetch_crypto_data()
 
     if data:
-        db = Database()
+        db = get_database()
         db.save_data(data)
         print(f"✓ {len(data)} registros salvos no banco de dados")
     else:
@@ -0,0 +1,419 @@
+"""
+Módulo de Banco de Dados PostgreSQL
+Backend compatível com PostgreSQL/TimescaleDB, com pool de conexões,
+ingestão em lote via COPY e tabela particionada por dia
+"""
+
+import csv
+import io
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import pandas as pd
+from psycopg2 import pool
+from database import StorageBackend, escape_like
+
+# Colunas gravadas pelo COPY, na ordem do CSV
+COPY_COLUMNS = ('timestamp', 'name', 'symbol', 'price', 'market_cap',
+                'volume_24h', 'change_24h', 'rank')
+
+# Marcador de NULL no CSV do COPY; um campo vazio continua sendo texto vazio
+COPY_NULL = '\\N'
+
+# Chave do advisory lock que serializa criação e remoção de partições
+PARTITION_LOCK_KEY = 726311
+
+
+class PostgresDatabase(StorageBackend):
+    """Classe para gerenciar operações no banco de dados PostgreSQL"""
+
+    placeholder = '%s'
+    like_operator = 'ILIKE'
+    position_function = 'strpos'
+
+    # Pools e semáforos, compartilhados entre instâncias
+    _pools = {}
+    _semaphores = {}
+    _lock = threading.Lock()
+
+    def __init__(self, dsn, min_connections=None, max_connections=None):
+        self.dsn = dsn
+
+        # Tamanho do pool configurável por DATABASE_POOL_MIN/DATABASE_POOL_MAX
+        if min_connections is None:
+            min_connections = int(os.environ.get('DATABASE_POOL_MIN', 1))
+        if max_connections is None:
+            max_connections = int(os.environ.get('DATABASE_POOL_MAX', 10))
+
+        with self._lock:
+            if dsn not in self._pools:
+                self._pools[dsn] = pool.ThreadedConnectionPool(
+                    min_connections, max_connections, dsn)
+                # getconn() falha com o pool cheio; o semáforo faz esperar
+                self._semaphores[dsn] = threading.BoundedSemaphore(
+                    max_connections)
+                try:
+                    self.create_tables()
+                except Exception:
+                    self._semaphores.pop(dsn)
+                    self._pools.pop(dsn).closeall()
+                    raise
+
+    @contextmanager
+    def get_connection(self):
+        """
+        Empresta uma conexão do pool, fazendo commit ou rollback ao final
+        Aguarda uma conexão livre quando todas estão em uso
+        """
+        connection_pool = self._pools[self.dsn]
+        semaphore = self._semaphores[self.dsn]
+
+        semaphore.acquire()
+        try:
+            conn = connection_pool.getconn()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                connection_pool.putconn(conn)
+        finally:
+            semaphore.release()
+
+    def close(self):
+        """Fecha todas as conexões do pool deste servidor"""
+        with self._lock:
+            self._semaphores.pop(self.dsn, None)
+            connection_pool = self._pools.pop(self.dsn, None)
+        if connection_pool:
+            connection_pool.closeall()
+
+    def read_query(self, query, params=None):
+        """
+        Executa uma consulta e retorna o resultado como DataFrame
+        Args:
+            query: SQL da consulta
+            params: Parâmetros da consulta (opcional)
+        Returns: DataFrame com o resultado
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
+                columns = [column[0] for column in cursor.description]
+                rows = cursor.fetchall()
+
+        return pd.DataFrame(rows, columns=columns)
+
+    def create_tables(self):
+        """Cria a tabela particionada e os índices no banco de dados"""
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS crypto_prices (
+                        id BIGSERIAL,
+                        timestamp TIMESTAMP NOT NULL,
+                        name TEXT NOT NULL,
+                        symbol TEXT NOT NULL,
+                        price DOUBLE PRECISION NOT NULL,
+                        market_cap DOUBLE PRECISION,
+                        volume_24h DOUBLE PRECISION,
+                        change_24h DOUBLE PRECISION,
+                        rank INTEGER
+                    ) PARTITION BY RANGE (timestamp)
+                ''')
+
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_timestamp_rank
+                    ON crypto_prices(timestamp, rank)
+                ''')
+
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_symbol_timestamp
+                    ON crypto_prices(symbol, timestamp)
+                ''')
+
+    @staticmethod
+    def partition_name(day):
+        """Retorna o nome da partição diária de uma data"""
+        return f"crypto_prices_{day.strftime('%Y%m%d')}"
+
+    @staticmethod
+    def list_partitions(cursor):
+        """Retorna os nomes das partições existentes de crypto_prices"""
+        cursor.execute('''
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+            JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+            WHERE parent.relname = 'crypto_prices'
+        ''')
+        return [row[0] for row in cursor.fetchall()]
+
+    def ensure_partitions(self, cursor, days):
+        """
+        Cria as partições diárias que ainda não existem
+        Args:
+            cursor: Cursor da transação de ingestão
+            days: Conjunto de datas que precisam de partição
+        """
+        # O lock vale até o fim da transação, então nenhum outro processo
+        # cria ou remove partições entre esta verificação e o COPY
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)',
+                       (PARTITION_LOCK_KEY,))
+
+        existing = set(self.list_partitions(cursor))
+
+        for day in sorted(days):
+            if self.partition_name(day) in existing:
+                continue
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {self.partition_name(day)}
+                PARTITION OF crypto_prices
+                FOR VALUES FROM (%s) TO (%s)
+            ''', (day, day + timedelta(days=1)))
+
+    def save_data(self, data_list):
+        """
+        Salva uma lista de dados no banco usando COPY
+        Args:
+            data_list: Lista de dicionários com dados das criptomoedas
+        """
+        if not data_list:
+            return
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for data in data_list:
+            writer.writerow([
+                COPY_NULL if data[column] is None else data[column]
+                for column in COPY_COLUMNS])
+        buffer.seek(0)
+
+        days = {pd.Timestamp(data['timestamp']).date()
+                for data in data_list}
+
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                self.ensure_partitions(cursor, days)
+                cursor.copy_expert(
+                    f"COPY crypto_prices ({', '.join(COPY_COLUMNS)}) "
+                    f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                    buffer)
+
+    def get_latest_data(self, limit=None):
+        """
+        Recupera os dados mais recentes
+        Args:
+            limit: Número máximo de linhas (opcional)
+        Returns: DataFrame com os dados mais recentes
+        """
+        query = '''
+            SELECT * FROM crypto_prices
+            WHERE timestamp = (SELECT MAX(timestamp) FROM crypto_prices)
+            ORDER BY rank
+        '''
+
+        if limit is not None:
+            return self.read_query(query + ' LIMIT %s', (int(limit),))
+
+        return self.read_query(query)
+
+    def get_latest_page(self, page=0, page_size=25, sort_by=None,
+                        filters=None):
+        """
+        Recupera uma página dos dados mais recentes, ordenando e filtrando no SQL
+        Args:
+            page: Índice da página (começa em 0)
+            page_size: Número de linhas por página
+            sort_by: Lista de tuplas (coluna, 'asc' ou 'desc')
+            filters: Lista de tuplas (coluna, operador, valor, caso)
+        Returns: Tupla (DataFrame da página, total de linhas filtradas)
+        """
+        where_clause, params, order_clause = self.build_page_clauses(
+            sort_by, filters)
+
+        query = f'''
+            SELECT * FROM crypto_prices
+            WHERE {where_clause}
+            ORDER BY {order_clause}
+            LIMIT %s OFFSET %s
+        '''
+
+        # Mesmo snapshot para o total e a página, mesmo com ingestão no meio
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL '
+                               'REPEATABLE READ READ ONLY')
+                cursor.execute(
+                    f'SELECT COUNT(*) FROM crypto_prices WHERE {where_clause}',
+                    params)
+                total_rows = cursor.fetchone()[0]
+
+                cursor.execute(query, (*params, int(page_size),
+                                       int(page) * int(page_size)))
+                columns = [column[0] for column in cursor.description]
+                df = pd.DataFrame(cursor.fetchall(), columns=columns)
+
+        return df, total_rows
+
+    def search_coins(self, search=None, limit=50):
+        """
+        Busca moedas do snapshot mais recente pelo nome ou símbolo
+        Args:
+            search: Texto a ser buscado (opcional)
+            limit: Número máximo de resultados
+        Returns: DataFrame com nome e símbolo das moedas encontradas
+        """
+        if search:
+            query = '''
+                SELECT name, symbol FROM crypto_prices
+                WHERE timestamp = (SELECT MAX(timestamp) FROM crypto_prices)
+                AND (name ILIKE %s ESCAPE '\\' OR symbol ILIKE %s ESCAPE '\\')
+                ORDER BY rank
+                LIMIT %s
+            '''
+            pattern = f'%{escape_like(search)}%'
+            return self.read_query(query, (pattern, pattern, int(limit)))
+
+        query = '''
+            SELECT name, symbol FROM crypto_prices
+            WHERE timestamp = (SELECT MAX(timestamp) FROM crypto_prices)
+            ORDER BY rank
+            LIMIT %s
+        '''
+        return self.read_query(query, (int(limit),))
+
+    def get_market_summary(self):
+        """
+        Calcula os totais de mercado do snapshot mais recente
+        Returns: Dicionário com market cap total e variação média
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute('''
+                    SELECT SUM(market_cap), AVG(change_24h)
+                    FROM crypto_prices
+                    WHERE timestamp = (SELECT MAX(timestamp) FROM crypto_prices)
+                ''')
+                result = cursor.fetchone()
+
+        return {
+            'total_market_cap': result[0] or 0,
+            'avg_change': result[1] or 0
+        }
+
+    def get_historical_data(self, symbol=None, hours=24):
+        """
+        Recupera dados históricos
+        Args:
+            symbol: Símbolo da criptomoeda (opcional)
+            hours: Número de horas para buscar histórico
+        Returns: DataFrame com dados históricos
+        """
+        cutoff_time = datetime.now() - timedelta(hours=hours)
+
+        if symbol:
+            query = '''
+                SELECT * FROM crypto_prices
+                WHERE symbol = %s AND timestamp >= %s
+                ORDER BY timestamp
+            '''
+            return self.read_query(query, (symbol, cutoff_time))
+
+        query = '''
+            SELECT * FROM crypto_prices
+            WHERE timestamp >= %s
+            ORDER BY timestamp
+        '''
+        return self.read_query(query, (cutoff_time,))
+
+    def get_statistics(self):
+        """
+        Calcula estatísticas gerais dos dados
+        Returns: Dicionário com estatísticas
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute('''
+                    SELECT COUNT(DISTINCT symbol), COUNT(*),
+                           MIN(timestamp), MAX(timestamp)
+                    FROM crypto_prices
+                ''')
+                result = cursor.fetchone()
+
+        return {
+            'total_coins': result[0],
+            'total_records': result[1],
+            'first_record': result[2],
+            'last_record': result[3]
+        }
+
+    def delete_old_data(self, days=7):
+        """
+        Remove dados mais antigos que X dias
+        Partições inteiramente antigas são descartadas com DROP TABLE
+        Args:
+            days: Número de dias para manter os dados
+        """
+        cutoff_date = datetime.now() - timedelta(days=days)
+        deleted_rows = 0
+
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)',
+                               (PARTITION_LOCK_KEY,))
+
+                for partition in self.list_partitions(cursor):
+                    try:
+                        day = datetime.strptime(partition[-8:], '%Y%m%d')
+                    except ValueError:
+                        continue
+                    if day + timedelta(days=1) > cutoff_date:
+                        continue
+
+                    cursor.execute(f'SELECT COUNT(*) FROM {partition}')
+                    deleted_rows += cursor.fetchone()[0]
+                    cursor.execute(f'DROP TABLE {partition}')
+
+                # Remove o restante da partição que contém a data de corte
+                cursor.execute('''
+                    DELETE FROM crypto_prices
+                    WHERE timestamp < %s
+                ''', (cutoff_date,))
+                deleted_rows += cursor.rowcount
+
+        return deleted_rows
+
+    def get_coin_summary(self, symbol):
+        """
+        Retorna um resumo estatístico de uma criptomoeda específica
+        Args:
+            symbol: Símbolo da criptomoeda
+        Returns: Dicionário com estatísticas
+        """
+        with self.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute('''
+                    SELECT
+                        COUNT(*) as total_records,
+                        AVG(price) as avg_price,
+                        MIN(price) as min_price,
+                        MAX(price) as max_price,
+                        AVG(volume_24h) as avg_volume
+                    FROM crypto_prices
+                    WHERE symbol = %s
+                ''', (symbol,))
+                result = cursor.fetchone()
+
+        if result:
+            return {
+                'total_records': result[0],
+                'avg_price': result[1],
+                'min_price': result[2],
+                'max_price': result[3],
+                'avg_volume': result[4]
+            }
+        return None